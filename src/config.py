@@ -1,9 +1,11 @@
 """配置管理模块"""
 
+import functools
+import json
+import mmap
 import os
 from typing import Optional, Literal
-from pydantic import BaseModel, Field
-import yaml
+from pydantic import BaseModel, ConfigDict, Field
 from pathlib import Path
 from loguru import logger
 
@@ -11,6 +13,8 @@ from loguru import logger
 class S3Config(BaseModel):
     """S3 云存储配置"""
 
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     access_key: str = Field(description="访问密钥 ID")
     secret_key: str = Field(description="访问密钥")
     endpoint: Optional[str] = Field(default=None, description="存储服务端点")
@@ -21,50 +25,162 @@ class S3Config(BaseModel):
     @classmethod
     def from_env(cls) -> Optional["S3Config"]:
         """从环境变量创建 S3 配置"""
-        access_key = os.getenv("S3_ACCESS_KEY")
-        secret_key = os.getenv("S3_SECRET_KEY")
-        bucket = os.getenv("S3_BUCKET")
-        logger.info(f"S3_ACCESS_KEY: {access_key}, S3_SECRET_KEY: {'***' if secret_key else None}, S3_BUCKET: {bucket}")
-        
+        env = os.environ
+        access_key = env.get("S3_ACCESS_KEY")
+        secret_key = env.get("S3_SECRET_KEY")
+        bucket = env.get("S3_BUCKET")
+        # 惰性格式化：日志级别过滤掉该条记录时不做任何字符串拼接
+        logger.opt(lazy=True).info(
+            "S3_ACCESS_KEY: {}, S3_SECRET_KEY: {}, S3_BUCKET: {}",
+            lambda: access_key,
+            lambda: "***" if secret_key else None,
+            lambda: bucket,
+        )
+
         if not all([access_key, secret_key, bucket]):
             return None
 
         return cls(
             access_key=access_key,  # type: ignore
             secret_key=secret_key,  # type: ignore
-            endpoint=os.getenv("S3_ENDPOINT"),
-            region=os.getenv("S3_REGION"),
+            endpoint=env.get("S3_ENDPOINT"),
+            region=env.get("S3_REGION"),
             bucket=bucket,  # type: ignore
-            base_url=os.getenv("S3_BASE_URL", ""),
+            base_url=env.get("S3_BASE_URL", ""),
         )
 
 
 class MCPServerConfig(BaseModel):
     """MCP 服务器配置"""
 
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     transport: Literal["stdio", "http", "sse", "streamable-http"] = Field(default="stdio", description="传输协议：stdio, http, sse, streamable-http")
     port: int = Field(default=8000, description="MCP 服务器端口")
+    upload_workers: int = Field(default=16, ge=1, description="并发上传线程数")
 
     @classmethod
     def from_env(cls) -> "MCPServerConfig":
         """从环境变量创建 MCP 服务器配置"""
-        transport_str = os.getenv("MCP_SERVER_TRANSPORT", "stdio")
+        env = os.environ
+        transport_str = env.get("MCP_SERVER_TRANSPORT", "stdio")
         # 验证 transport 值
         valid_transports = ["stdio", "http", "sse", "streamable-http"]
         transport = transport_str if transport_str in valid_transports else "stdio"
-        port = int(os.getenv("MCP_SERVER_PORT", "8000"))
+        port = int(env.get("MCP_SERVER_PORT", "8000"))
+        upload_workers = int(env.get("MCP_SERVER_UPLOAD_WORKERS", "16"))
 
-        return cls(transport=transport, port=port)  # type: ignore
+        return cls(transport=transport, port=port, upload_workers=upload_workers)  # type: ignore
 
 
 class ServerConfig(BaseModel):
     """MCP 服务器配置"""
 
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     s3: S3Config
     mcp_server: MCPServerConfig = Field(default_factory=MCPServerConfig)
     log_level: str = Field(default="INFO", description="日志级别")
 
 
+# JSON 缓存格式版本，配置模型字段变化时递增，使旧缓存失效
+CONFIG_CACHE_VERSION = 1
+
+
+def _construct_cached(model: type[BaseModel], data: dict) -> BaseModel:
+    """以缓存数据直接构造模型，跳过校验；model_construct 不检查必填字段，缺失时需手动抛出异常"""
+    missing = [name for name, field in model.model_fields.items() if field.is_required() and name not in data]
+    if missing:
+        raise KeyError(f"{model.__name__} 缺少字段: {', '.join(missing)}")
+    return model.model_construct(**data)
+
+
+def _read_json_cache(cache_path: str, source: dict) -> Optional[dict]:
+    """读取 JSON 缓存，缓存不存在或与配置文件的 (修改时间, 大小) 不一致时返回 None"""
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    # 仅在记录的源文件信息完全一致时使用缓存：配置文件被替换为修改时间更旧的版本（cp -p、rsync -t 等）时同样失效
+    if not isinstance(cached, dict) or cached.get("version") != CONFIG_CACHE_VERSION or cached.get("source") != source:
+        return None
+    return cached.get("config")
+
+
+def _write_json_cache(cache_path: str, source: dict, config_data: dict) -> None:
+    """原子写入 JSON 缓存（临时文件 + rename），失败时仅记录警告"""
+    cache_dir = os.path.dirname(cache_path)
+    if not os.access(cache_dir, os.W_OK):
+        # 只读目录（如挂载的 ConfigMap）下无法缓存，每次启动都会遇到，不视为异常
+        logger.debug("配置目录不可写，跳过配置缓存: {}", cache_dir)
+        return
+
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        # 缓存中包含密钥，仅允许当前用户读写
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": CONFIG_CACHE_VERSION, "source": source, "config": config_data}, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning("写入配置缓存失败: {}", e)
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_file_cached(path: str, mtime_ns: int, size: int) -> ServerConfig:
+    """解析配置文件，按 (路径, 修改时间, 大小) 缓存，文件变更后自动失效
+
+    进程间通过 `<path>.cache.json` 缓存校验后的配置，热启动时跳过 YAML 解析。
+    """
+    cache_path = f"{path}.cache.json"
+    source = {"mtime_ns": mtime_ns, "size": size}
+    cached_data = _read_json_cache(cache_path, source)
+    if cached_data is not None:
+        try:
+            # 缓存写入前已完成校验，直接构造以跳过 pydantic 的重复校验
+            return _construct_cached(
+                ServerConfig,
+                {
+                    **cached_data,
+                    "s3": _construct_cached(S3Config, cached_data["s3"]),
+                    "mcp_server": _construct_cached(MCPServerConfig, cached_data["mcp_server"]),
+                },
+            )
+        except (KeyError, TypeError) as e:
+            logger.warning("配置缓存无效，重新解析配置文件: {}", e)
+
+    # 仅在缓存未命中时才导入 yaml，缩短冷启动时间
+    import yaml
+
+    # 优先使用 libyaml 的 C 实现，未编译 libyaml 时回退到纯 Python 解析器
+    Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+    # mmap 无法映射空文件，提前给出明确的错误
+    if size == 0:
+        raise ValueError(f"配置文件为空: {path}")
+
+    try:
+        # 以字节方式映射文件交给 libyaml，由 C 层完成解码，省去 Python 层的 str 拷贝
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            config_data = yaml.load(mm, Loader=Loader)
+
+        config = ServerConfig(**config_data)
+    except yaml.YAMLError as e:
+        # mmap 对象没有文件名，YAML 错误中只显示 "<file>"，因此在消息中带上路径
+        raise ValueError(f"配置文件格式错误 ({path}): {e}")
+    except Exception as e:
+        raise ValueError(f"加载配置失败: {e}")
+
+    _write_json_cache(cache_path, source, config.model_dump(mode="json"))
+    return config
+
+
 def load_config_from_file() -> ServerConfig:
     """从配置文件加载配置
 
@@ -76,18 +192,13 @@ def load_config_from_file() -> ServerConfig:
         ValueError: 配置文件格式错误
     """
     config_file = Path("config.yaml")
-    if not config_file.exists():
-        raise FileNotFoundError(f"配置文件不存在: {config_file}")
-
+    # 直接 stat 获取修改时间和大小，同时用于判断文件是否存在，避免重复系统调用
     try:
-        with open(config_file, "r", encoding="utf-8") as f:
-            config_data = yaml.safe_load(f)
+        stat = config_file.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"配置文件不存在: {config_file}")
 
-        return ServerConfig(**config_data)
-    except yaml.YAMLError as e:
-        raise ValueError(f"配置文件格式错误: {e}")
-    except Exception as e:
-        raise ValueError(f"加载配置失败: {e}")
+    return _load_config_file_cached(str(config_file.resolve()), stat.st_mtime_ns, stat.st_size)
 
 
 def load_config_from_env() -> Optional[ServerConfig]:
@@ -106,7 +217,7 @@ def load_config_from_env() -> Optional[ServerConfig]:
         logger.info("MCP 服务器配置不完整，无法从环境变量加载")
         return None
 
-    log_level = os.getenv("LOG_LEVEL", "INFO")
+    log_level = os.environ.get("LOG_LEVEL", "INFO")
 
     return ServerConfig(s3=s3_config, mcp_server=mcp_server_config, log_level=log_level)
 
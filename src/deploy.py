@@ -1,31 +1,69 @@
-from src.s3 import S3Client
-import tempfile
-import os
+import gzip
+import threading
+from typing import Optional, Union
+
+from src.s3 import MULTIPART_THRESHOLD, S3Client, calc_sha256
 from loguru import logger
 
-s3_client = S3Client()
+# 小于该大小的内容压缩收益有限，直接上传
+GZIP_MIN_SIZE = 1024
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+
+def get_s3_client() -> S3Client:
+    """获取 S3 客户端，首次上传时才创建"""
+    global _s3_client
+    if _s3_client is None:
+        # 上传在线程池中执行，加锁避免并发创建多个客户端
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_client = S3Client()
+    return _s3_client
+
 
+def close_s3_client() -> None:
+    """关闭 S3 客户端，释放复用的连接"""
+    global _s3_client
+    with _s3_client_lock:
+        if _s3_client is not None:
+            _s3_client.close()
+            _s3_client = None
 
-def upload_html_content(html_content: str, filename: str) -> str:
-    """上传 HTML 内容到 S3 存储"""
-    temp_path = None
+
+def upload_html_content(html_content: Union[str, bytes], filename: Optional[str] = None) -> str:
+    """上传 HTML 内容到 S3 存储，已编码的字节内容直接上传，不再重复编码
+
+    未指定 filename 时以内容的 SHA256 作为对象键，相同内容重复部署时跳过上传。
+    """
     try:
-        # 创建临时文件
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".html", delete=False, encoding="utf-8") as temp_file:
-            temp_file.write(html_content)
-            temp_path = temp_file.name
-
-        # 上传文件
-        file_url = s3_client.upload_file(
-            temp_path,
-            filename,
-            ExtraArgs={
-                "ContentType": "text/html",
-                "ContentDisposition": "inline",
-                "CacheControl": "max-age=31536000",
-            },
+        data = html_content.encode("utf-8") if isinstance(html_content, str) else html_content
+        sha256_hex, sha256_b64 = calc_sha256(data)
+
+        extra_args = {
+            "ContentType": "text/html; charset=utf-8",
+            "ContentDisposition": "inline",
+            "CacheControl": "max-age=31536000",
+        }
+        body = data
+        if len(data) >= GZIP_MIN_SIZE:
+            # HTML 压缩率高，以 gzip 存储可大幅减少上传字节数，浏览器按 Content-Encoding 自动解压；
+            # mtime=0 保证相同内容压缩结果一致
+            body = gzip.compress(data, compresslevel=6, mtime=0)
+            extra_args["ContentEncoding"] = "gzip"
+            # 校验和需按实际上传的压缩内容计算；分片上传时由 boto3 按分片计算，无需在此计算
+            sha256_b64 = calc_sha256(body)[1] if len(body) < MULTIPART_THRESHOLD else None
+
+        # 直接从内存上传，避免临时文件的写入、重读和删除；对象键仍以原始内容的 SHA256 计算
+        file_url = get_s3_client().upload_bytes(
+            body,
+            filename or f"{sha256_hex}.html",
+            ExtraArgs=extra_args,
+            checksum_sha256=sha256_b64,
+            skip_existing=filename is None,
         )
-        logger.info(f"HTML 内容上传成功: {file_url}")
+        logger.info("HTML 内容上传成功: {}", file_url)
 
         return file_url
 
@@ -33,7 +71,3 @@ def upload_html_content(html_content: str, filename: str) -> str:
         error_msg = f"HTML 内容上传失败: {str(e)}"
         logger.error(error_msg)
         raise
-    finally:
-        # 清理临时文件
-        if temp_path and os.path.exists(temp_path):
-            os.unlink(temp_path)
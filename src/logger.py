@@ -2,13 +2,25 @@ import sys
 from loguru import logger
 
 
-def setup_logging():
-    """配置日志系统"""
+def setup_logging(level: str = "DEBUG"):
+    """配置日志系统，低于 level 的日志在进入格式化前即被过滤"""
+    # 在移除默认处理器前校验日志级别，无效时回退到 INFO，避免异常发生在没有任何输出处理器的时候
+    level = level.upper()
+    invalid_level = None
+    try:
+        logger.level(level)
+    except ValueError:
+        invalid_level, level = level, "INFO"
+
     # 清除默认处理器
     logger.remove()
 
-    # 定义统一的日志格式
-    log_format = "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+    # 精简的日志格式：不含颜色标签和调用位置，降低每条日志的格式化开销
+    log_format = "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {message}"
+
+    # 添加控制台日志：写入 stderr，避免污染 stdio 传输的协议输出；
+    # enqueue=True 由后台线程完成格式化和写入，不阻塞事件循环
+    logger.add(sys.stderr, colorize=False, format=log_format, level=level, enqueue=True)
 
-    # 添加控制台日志
-    logger.add(sys.stdout, colorize=True, format=log_format, level="DEBUG")
+    if invalid_level is not None:
+        logger.warning("无效的日志级别 {}，使用 INFO", invalid_level)
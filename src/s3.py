@@ -1,9 +1,27 @@
+import binascii
+import hashlib
+import io
 import os
-import boto3
+from typing import Tuple
 from botocore.exceptions import ClientError
 from loguru import logger
 from src.config import get_config
 
+# 小于该大小的内容使用单次 PUT 上传，达到该大小则按同样大小分片并发上传
+MULTIPART_THRESHOLD = 5 * 1024 * 1024
+
+# 单个分片上传的并发线程数
+MULTIPART_MAX_CONCURRENCY = 10
+
+# 条件写入遇到并发冲突（409）时的最大尝试次数
+CONDITIONAL_PUT_ATTEMPTS = 3
+
+
+def calc_sha256(data: bytes) -> Tuple[str, str]:
+    """计算内容的 SHA256，返回 (十六进制摘要, base64 摘要)"""
+    digest = hashlib.sha256(data).digest()
+    return digest.hex(), binascii.b2a_base64(digest, newline=False).decode("ascii")
+
 
 class StorageError(Exception):
     """存储操作相关的异常"""
@@ -18,8 +36,15 @@ class S3Client:
             logger.error("S3 配置未找到，无法初始化 S3 客户端")
             self.s3_client = None
             self.s3_config = None
+            self._url_prefix = ""
+            self._conditional_put = False
             return
 
+        # boto3 导入较重，延迟到真正创建客户端时
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+        from botocore.config import Config
+
         self.s3_config = config.s3
         self.s3_client = boto3.client(
             "s3",
@@ -27,7 +52,30 @@ class S3Client:
             aws_secret_access_key=self.s3_config.secret_key,
             endpoint_url=self.s3_config.endpoint,
             region_name=self.s3_config.region,
+            # 连接池按并发上传线程数计算（每个上传线程分片上传时最多占用 MULTIPART_MAX_CONCURRENCY 个连接），
+            # 保证连接都能复用而不被丢弃重建，并使用自适应重试
+            config=Config(
+                max_pool_connections=config.mcp_server.upload_workers * MULTIPART_MAX_CONCURRENCY,
+                retries={"max_attempts": 10, "mode": "adaptive"},
+                tcp_keepalive=True,
+            ),
         )
+        # 超过阈值的内容自动分片，并由多个线程并发上传各分片
+        self._transfer_config = TransferConfig(
+            multipart_threshold=MULTIPART_THRESHOLD,
+            multipart_chunksize=MULTIPART_THRESHOLD,
+            max_concurrency=MULTIPART_MAX_CONCURRENCY,
+            use_threads=True,
+        )
+        # 存储服务是否支持条件写入（If-None-Match），首次收到 501 后置为 False
+        self._conditional_put = True
+        # 访问 URL 前缀在实例生命周期内不变，初始化时计算一次
+        self._url_prefix = f"{self.s3_config.base_url.rstrip('/')}/"
+
+    def close(self):
+        """关闭底层 HTTP 连接池"""
+        if self.s3_client:
+            self.s3_client.close()
 
     def upload_file(self, local_file_path, s3_file_name=None, ExtraArgs=None):
         if not self.s3_client or not self.s3_config:
@@ -43,11 +91,108 @@ class S3Client:
                 self.s3_config.bucket,
                 s3_file_name,
                 ExtraArgs=ExtraArgs,
+                Config=self._transfer_config,
             )
-            file_url = f"{self.s3_config.base_url}/{s3_file_name}"
-            logger.info(f"文件已成功上传到 S3: {file_url}")
+            file_url = self._url_prefix + s3_file_name
+            logger.info("文件已成功上传到 S3: {}", file_url)
             return file_url
+        except FileNotFoundError as e:
+            # 不预先检查文件是否存在，直接由打开文件时的异常判断，少一次 stat 且无竞态
+            error_msg = f"本地文件不存在: {local_file_path}"
+            logger.error(error_msg)
+            raise StorageError(error_msg) from e
         except ClientError as e:
             error_msg = f"上传文件到 S3 时出错: {e}"
             logger.error(error_msg)
             raise StorageError(error_msg) from e
+
+    def upload_bytes(self, data, s3_file_name, ExtraArgs=None, checksum_sha256=None, skip_existing=False):
+        """直接从内存上传字节内容，无需落盘临时文件
+
+        skip_existing 为 True 时（内容寻址的对象键），若对象已存在则跳过上传直接返回 URL。
+        """
+        if not self.s3_client or not self.s3_config:
+            error_msg = "S3 客户端未初始化，无法上传文件"
+            logger.error(error_msg)
+            raise StorageError(error_msg)
+
+        file_url = self._url_prefix + s3_file_name
+        try:
+            if len(data) < MULTIPART_THRESHOLD:
+                # 小文件一次 PUT 完成，显式给出 ContentLength 和校验和，避免分片上传的额外请求
+                if checksum_sha256 is None:
+                    _, checksum_sha256 = calc_sha256(data)
+                put_args = dict(
+                    Bucket=self.s3_config.bucket,
+                    Key=s3_file_name,
+                    Body=data,
+                    ContentLength=len(data),
+                    ChecksumSHA256=checksum_sha256,
+                    **(ExtraArgs or {}),
+                )
+                if skip_existing and self._conditional_put:
+                    if not self._put_if_absent(put_args):
+                        logger.info("文件已存在，跳过上传: {}", file_url)
+                        return file_url
+                else:
+                    self.s3_client.put_object(**put_args)
+            else:
+                if skip_existing and self._object_exists(s3_file_name):
+                    logger.info("文件已存在，跳过上传: {}", file_url)
+                    return file_url
+                # 分片上传的校验和需按分片计算，交给 boto3 处理
+                self.s3_client.upload_fileobj(
+                    io.BytesIO(data),
+                    self.s3_config.bucket,
+                    s3_file_name,
+                    ExtraArgs={**(ExtraArgs or {}), "ChecksumAlgorithm": "SHA256"},
+                    Config=self._transfer_config,
+                )
+            logger.info("文件已成功上传到 S3: {}", file_url)
+            return file_url
+        except ClientError as e:
+            error_msg = f"上传文件到 S3 时出错: {e}"
+            logger.error(error_msg)
+            raise StorageError(error_msg) from e
+
+    def _put_if_absent(self, put_args):
+        """条件写入（If-None-Match: *），对象已存在时返回 False
+
+        并发写入同一对象键时服务端返回 409 ConditionalRequestConflict，按 AWS 建议重试；
+        存储服务不支持条件写入时（501 NotImplemented）回退为普通 PUT，并在之后的上传中不再尝试。
+        """
+        for _ in range(CONDITIONAL_PUT_ATTEMPTS):
+            try:
+                self.s3_client.put_object(IfNoneMatch="*", **put_args)
+                return True
+            except ClientError as e:
+                code = e.response.get("Error", {}).get("Code")
+                if code in ("PreconditionFailed", "412"):
+                    return False
+                if code in ("ConditionalRequestConflict", "409"):
+                    logger.debug("条件写入冲突，重试: {}", put_args["Key"])
+                    continue
+                if code in ("NotImplemented", "501"):
+                    logger.warning("存储服务不支持条件写入，回退为普通 PUT")
+                    self._conditional_put = False
+                    break
+                raise
+
+        # 对象键由内容哈希决定，并发写入的是相同内容，直接覆盖写入即可
+        self.s3_client.put_object(**put_args)
+        return True
+
+    def _object_exists(self, s3_file_name):
+        """通过 HEAD 请求判断对象是否已存在"""
+        try:
+            self.s3_client.head_object(Bucket=self.s3_config.bucket, Key=s3_file_name)
+            return True
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if code in ("404", "NoSuchKey", "NotFound"):
+                return False
+            if code in ("403", "AccessDenied", "Forbidden"):
+                # 仅有上传权限的凭证无法 HEAD 对象，此时无法判断是否存在，直接上传
+                logger.debug("无权限检查对象是否存在，直接上传: {}", s3_file_name)
+                return False
+            raise
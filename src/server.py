@@ -1,7 +1,8 @@
 import asyncio
+import functools
 import signal
-import sys
-from typing import Any, Dict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List
 
 from fastmcp import FastMCP
 from pydantic import Field
@@ -9,15 +10,53 @@ from loguru import logger
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
-from src.deploy import upload_html_content
+from src.deploy import close_s3_client, get_s3_client, upload_html_content
 
-from nanoid import generate
 from src.logger import setup_logging
 from src.config import get_config
 
 # 创建 MCP 服务器
 mcp = FastMCP("mcp-webpage-to-s3", stateless_http=True, json_response=True)
 
+# 优先使用 uvloop 事件循环（Windows 等平台不可用时回退到默认 asyncio 事件循环）
+try:
+    import uvloop
+
+    _loop_factory = uvloop.new_event_loop
+except ImportError:
+    _loop_factory = None
+
+# HTTP 传输使用 httptools 解析器，并关闭 uvicorn 访问日志（省去每个请求一次标准库 logging 调用）；
+# 收到终止信号后最多等待 25 秒让进行中的请求返回响应（FastMCP 默认为 0，会立即取消请求），
+# 留在常见的 30 秒强制终止期限之内
+UVICORN_CONFIG = {"http": "httptools", "access_log": False, "timeout_graceful_shutdown": 25}
+
+# 上传线程池：boto3 为同步阻塞调用，放到线程中执行，避免阻塞事件循环
+_upload_executor = None
+
+
+def get_upload_executor() -> ThreadPoolExecutor:
+    """获取上传线程池，线程数由 mcp_server.upload_workers 配置"""
+    global _upload_executor
+    if _upload_executor is None:
+        _upload_executor = ThreadPoolExecutor(max_workers=get_config().mcp_server.upload_workers, thread_name_prefix="s3-upload")
+    return _upload_executor
+
+
+def shutdown_upload_executor() -> None:
+    """关闭上传线程池，等待进行中的上传完成"""
+    global _upload_executor
+    if _upload_executor is not None:
+        logger.info("等待进行中的上传完成...")
+        _upload_executor.shutdown(wait=True)
+        _upload_executor = None
+
+
+def _log_warmup_failure(future: Future) -> None:
+    """S3 客户端预热失败时记录警告，避免问题拖到首个部署请求才暴露"""
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning("S3 客户端预热失败: {}", future.exception())
+
 
 # 健康检查端点，用于 ByteFaaS 平台健康检查
 @mcp.custom_route("/v1/ping", methods=["GET"])
@@ -27,17 +66,18 @@ async def v1_ping(_request: Request) -> JSONResponse:
 
 
 @mcp.tool(name="deploy_html_to_s3", description="部署网页内容到 S3 存储")
-def deploy_html_to_s3(html_content: str = Field(description="网页内容")) -> Dict[str, Any]:
+async def deploy_html_to_s3(html_content: str = Field(description="网页内容")) -> Dict[str, Any]:
     try:
         logger.info("开始部署 HTML 内容")
 
-        # 使用 nanoid 生成随机文件名，确保唯一性
-        filename = generate(alphabet="0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ", size=16)
+        # 以内容的 SHA256 作为文件名，相同内容重复部署时直接复用已有对象
+        loop = asyncio.get_running_loop()
+        file_url = await loop.run_in_executor(
+            get_upload_executor(),
+            functools.partial(upload_html_content, html_content=html_content),
+        )
 
-        # 使用存储包装器的专用方法上传 HTML 内容
-        file_url = upload_html_content(html_content=html_content, filename=filename)
-
-        logger.info(f"HTML 文件部署成功: {file_url}")
+        logger.info("HTML 文件部署成功: {}", file_url)
 
         return {"success": True, "message": "HTML 文件部署成功", "url": file_url}
 
@@ -47,38 +87,70 @@ def deploy_html_to_s3(html_content: str = Field(description="网页内容")) ->
         return {"success": False, "error": error_msg}
 
 
-def run_server():
-    """运行 MCP Libcloud Server"""
+@mcp.tool(name="deploy_html_batch", description="批量部署多个网页内容到 S3 存储")
+async def deploy_html_batch(html_contents: List[str] = Field(description="网页内容列表")) -> Dict[str, Any]:
+    logger.info("开始批量部署 {} 个 HTML 内容", len(html_contents))
+
+    # 各上传并发提交到线程池，共享 boto3 连接池，重叠各请求的网络往返
+    loop = asyncio.get_running_loop()
+    executor = get_upload_executor()
+    outcomes = await asyncio.gather(
+        *[loop.run_in_executor(executor, functools.partial(upload_html_content, html_content=html)) for html in html_contents],
+        return_exceptions=True,
+    )
+
+    results = []
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            error_msg = f"HTML 部署异常: {str(outcome)}"
+            logger.error(error_msg)
+            results.append({"success": False, "error": error_msg})
+        else:
+            results.append({"success": True, "url": outcome})
 
-    setup_logging()
+    succeeded = sum(1 for r in results if r["success"])
+    logger.info("批量部署完成: 成功 {}/{}", succeeded, len(results))
 
-    # 设置信号处理函数
-    def signal_handler(_sig, _frame):
-        logger.info("收到终止信号，正在优雅关闭服务...")
-        sys.exit(0)
+    return {"success": succeeded == len(results), "message": f"成功部署 {succeeded}/{len(results)} 个 HTML 文件", "results": results}
 
-    # 注册 SIGINT 信号处理函数（Ctrl+C）
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
 
-    logger.info("mcp web deploy 服务启动...")
+def run_server():
+    """运行 MCP Libcloud Server"""
+
+    # SIGTERM 与 Ctrl+C 同样处理：抛出 KeyboardInterrupt，由事件循环取消任务后正常退出，
+    # 而不是 sys.exit 直接中断进行中的上传（HTTP 传输下 uvicorn 会自行接管这两个信号，
+    # 并按 timeout_graceful_shutdown 等待进行中的请求完成）
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
 
     try:
         # 加载配置并创建服务器
         config = get_config()
 
+        # 按配置的日志级别初始化日志，被过滤的日志不再产生格式化开销
+        setup_logging(config.log_level)
+        logger.info("mcp web deploy 服务启动...")
+
+        # 在上传线程池中预热 S3 客户端（导入 boto3 并创建客户端），与服务启动并行，避免首个请求承担该开销
+        get_upload_executor().submit(get_s3_client).add_done_callback(_log_warmup_failure)
+
         # 根据传输协议选择合适的启动方式
         transport = config.mcp_server.transport
 
-        logger.info(f"启动 {transport} 传输模式")
+        logger.info("启动 {} 传输模式", transport)
         if transport == "stdio":
-            asyncio.run(mcp.run_async())
+            asyncio.run(mcp.run_async(), loop_factory=_loop_factory)
             logger.info("服务启动成功")
         else:
-            # 使用更优雅的方式启动服务器
-            mcp.run(transport=transport, host="0.0.0.0", port=config.mcp_server.port)
+            # uvicorn 在 FastMCP 创建的事件循环中运行，因此由 loop_factory 指定 uvloop
+            asyncio.run(
+                mcp.run_async(transport=transport, host="0.0.0.0", port=config.mcp_server.port, uvicorn_config=UVICORN_CONFIG),
+                loop_factory=_loop_factory,
+            )
 
     except KeyboardInterrupt:
         logger.info("收到键盘中断，正在关闭服务...")
     except Exception as e:
-        logger.error(f"服务发生异常: {e}")
+        logger.error("服务发生异常: {}", e)
+    finally:
+        shutdown_upload_executor()
+        close_s3_client()
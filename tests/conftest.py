@@ -0,0 +1,16 @@
+import pytest
+
+import src.s3
+from src.config import S3Config, ServerConfig
+from src.s3 import S3Client
+
+
+@pytest.fixture
+def client(monkeypatch):
+    config = ServerConfig(
+        s3=S3Config(access_key="ak", secret_key="sk", region="us-east-1", bucket="bucket1", base_url="https://cdn.example.com")
+    )
+    monkeypatch.setattr(src.s3, "get_config", lambda: config)
+    s3_client = S3Client()
+    yield s3_client
+    s3_client.close()
@@ -0,0 +1,132 @@
+"""配置文件加载与 JSON 缓存测试"""
+
+import json
+import os
+
+import pytest
+
+from src.config import _load_config_file_cached, load_config_from_file
+
+CONFIG_YAML = """
+s3:
+  access_key: ak
+  secret_key: sk
+  bucket: {bucket}
+  base_url: https://cdn.example.com
+log_level: INFO
+"""
+
+
+@pytest.fixture(autouse=True)
+def config_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _load_config_file_cached.cache_clear()
+    yield tmp_path
+    _load_config_file_cached.cache_clear()
+
+
+def _write_config(path, bucket, mtime=None):
+    path.write_text(CONFIG_YAML.format(bucket=bucket), encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def _load_in_new_process():
+    """清空进程内缓存，模拟新进程启动"""
+    _load_config_file_cached.cache_clear()
+    return load_config_from_file()
+
+
+def test_cache_miss_parses_yaml_and_writes_sidecar(config_dir):
+    _write_config(config_dir / "config.yaml", "bucket-a")
+
+    assert load_config_from_file().s3.bucket == "bucket-a"
+
+    cached = json.loads((config_dir / "config.yaml.cache.json").read_text(encoding="utf-8"))
+    assert cached["config"]["s3"]["bucket"] == "bucket-a"
+    assert oct((config_dir / "config.yaml.cache.json").stat().st_mode & 0o777) == oct(0o600)
+
+
+def test_cache_hit_reads_sidecar(config_dir):
+    _write_config(config_dir / "config.yaml", "bucket-a")
+    load_config_from_file()
+
+    # 篡改缓存中的值，命中缓存时应读到篡改后的值
+    cache_file = config_dir / "config.yaml.cache.json"
+    cached = json.loads(cache_file.read_text(encoding="utf-8"))
+    cached["config"]["s3"]["bucket"] = "from-cache"
+    cache_file.write_text(json.dumps(cached), encoding="utf-8")
+
+    assert _load_in_new_process().s3.bucket == "from-cache"
+
+
+def test_edited_config_invalidates_cache(config_dir):
+    _write_config(config_dir / "config.yaml", "bucket-a")
+    load_config_from_file()
+
+    _write_config(config_dir / "config.yaml", "bucket-edited")
+
+    assert load_config_from_file().s3.bucket == "bucket-edited"
+    assert _load_in_new_process().s3.bucket == "bucket-edited"
+
+
+def test_config_replaced_with_older_mtime_invalidates_cache(config_dir):
+    _write_config(config_dir / "config.yaml", "bucket-a", mtime=2_000_000_000)
+    load_config_from_file()
+
+    # 模拟 cp -p / rsync -t：替换为修改时间更旧的文件
+    _write_config(config_dir / "config.yaml", "bucket-b", mtime=1_000_000_000)
+
+    assert _load_in_new_process().s3.bucket == "bucket-b"
+
+
+def test_read_only_config_dir_skips_cache_write(config_dir, monkeypatch):
+    _write_config(config_dir / "config.yaml", "bucket-a")
+    # 模拟只读挂载的配置目录（以 root 运行时目录权限不生效）
+    monkeypatch.setattr(os, "access", lambda path, mode: False)
+
+    assert load_config_from_file().s3.bucket == "bucket-a"
+    assert not (config_dir / "config.yaml.cache.json").exists()
+
+
+def test_cache_with_other_version_falls_back_to_yaml(config_dir):
+    _write_config(config_dir / "config.yaml", "bucket-a")
+    load_config_from_file()
+
+    cache_file = config_dir / "config.yaml.cache.json"
+    cached = json.loads(cache_file.read_text(encoding="utf-8"))
+    cached["version"] = 0
+    cached["config"]["s3"]["bucket"] = "from-cache"
+    cache_file.write_text(json.dumps(cached), encoding="utf-8")
+
+    assert _load_in_new_process().s3.bucket == "bucket-a"
+
+
+def test_cache_missing_required_fields_falls_back_to_yaml(config_dir):
+    _write_config(config_dir / "config.yaml", "bucket-a")
+    load_config_from_file()
+
+    # 模拟模型新增必填字段前写入的缓存
+    cache_file = config_dir / "config.yaml.cache.json"
+    cached = json.loads(cache_file.read_text(encoding="utf-8"))
+    cached["config"]["s3"] = {"access_key": "a"}
+    cache_file.write_text(json.dumps(cached), encoding="utf-8")
+
+    config = _load_in_new_process()
+    assert config.s3.bucket == "bucket-a"
+    assert config.s3.secret_key == "sk"
+
+
+def test_empty_config_file_reports_clear_error(config_dir):
+    (config_dir / "config.yaml").write_text("", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="配置文件为空"):
+        load_config_from_file()
+
+
+def test_yaml_error_reports_config_path(config_dir):
+    (config_dir / "config.yaml").write_text("s3: [unclosed\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="配置文件格式错误") as exc_info:
+        load_config_from_file()
+    assert str(config_dir / "config.yaml") in str(exc_info.value)
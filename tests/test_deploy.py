@@ -0,0 +1,68 @@
+"""HTML 部署测试"""
+
+import base64
+import gzip
+import os
+
+import pytest
+from botocore.stub import Stubber
+
+import src.deploy
+from src.deploy import GZIP_MIN_SIZE, upload_html_content
+from src.s3 import MULTIPART_THRESHOLD, calc_sha256
+
+
+@pytest.fixture
+def put_params(client, monkeypatch):
+    """记录 put_object 的请求参数"""
+    monkeypatch.setattr(src.deploy, "_s3_client", client)
+    captured = []
+    client.s3_client.meta.events.register("before-parameter-build.s3.PutObject", lambda params, **kwargs: captured.append(dict(params)))
+    return captured
+
+
+def _deploy(client, html):
+    with Stubber(client.s3_client) as stubber:
+        stubber.add_response("put_object", {})
+        url = upload_html_content(html)
+        stubber.assert_no_pending_responses()
+    return url
+
+
+def test_large_html_is_stored_gzip_encoded(client, put_params):
+    html = "<p>hello</p>" * GZIP_MIN_SIZE
+
+    url = _deploy(client, html)
+
+    (params,) = put_params
+    assert params["ContentEncoding"] == "gzip"
+    assert gzip.decompress(params["Body"]) == html.encode("utf-8")
+    assert params["ChecksumSHA256"] == calc_sha256(params["Body"])[1]
+    assert params["ContentLength"] == len(params["Body"])
+    # 对象键按原始内容计算
+    assert url == f"https://cdn.example.com/{calc_sha256(html.encode('utf-8'))[0]}.html"
+
+
+def test_small_html_is_stored_raw(client, put_params):
+    html = "<p>hi</p>"
+
+    _deploy(client, html)
+
+    (params,) = put_params
+    assert "ContentEncoding" not in params
+    assert params["Body"] == html.encode("utf-8")
+    assert params["ChecksumSHA256"] == calc_sha256(params["Body"])[1]
+
+
+def test_multipart_sized_body_skips_checksum(client, monkeypatch):
+    monkeypatch.setattr(src.deploy, "_s3_client", client)
+    calls = []
+    monkeypatch.setattr(client, "upload_bytes", lambda body, key, **kwargs: calls.append((body, kwargs)) or key)
+    # 随机内容几乎不可压缩，压缩后仍超过分片阈值
+    html = base64.b64encode(os.urandom(MULTIPART_THRESHOLD)).decode("ascii")
+
+    upload_html_content(html)
+
+    ((body, kwargs),) = calls
+    assert len(body) >= MULTIPART_THRESHOLD
+    assert kwargs["checksum_sha256"] is None
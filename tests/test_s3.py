@@ -0,0 +1,89 @@
+"""S3Client 去重上传测试"""
+
+import pytest
+from botocore.stub import ANY, Stubber
+
+import src.s3
+from src.s3 import CONDITIONAL_PUT_ATTEMPTS, MULTIPART_MAX_CONCURRENCY, MULTIPART_THRESHOLD, StorageError, calc_sha256
+
+DATA = b"<html>hello</html>"
+KEY = f"{calc_sha256(DATA)[0]}.html"
+URL = f"https://cdn.example.com/{KEY}"
+
+
+def _put_params(conditional):
+    params = {"Bucket": "bucket1", "Key": KEY, "Body": DATA, "ContentLength": len(DATA), "ChecksumSHA256": ANY}
+    if conditional:
+        params["IfNoneMatch"] = "*"
+    return params
+
+
+def _upload(client):
+    return client.upload_bytes(DATA, KEY, skip_existing=True)
+
+
+def test_conditional_put_uploads_new_object(client):
+    with Stubber(client.s3_client) as stubber:
+        stubber.add_response("put_object", {}, _put_params(conditional=True))
+        assert _upload(client) == URL
+        stubber.assert_no_pending_responses()
+
+
+def test_conditional_put_skips_existing_object(client):
+    with Stubber(client.s3_client) as stubber:
+        stubber.add_client_error("put_object", "PreconditionFailed", http_status_code=412, expected_params=_put_params(conditional=True))
+        assert _upload(client) == URL
+        stubber.assert_no_pending_responses()
+
+
+def test_conditional_put_retries_on_conflict(client):
+    with Stubber(client.s3_client) as stubber:
+        stubber.add_client_error("put_object", "ConditionalRequestConflict", http_status_code=409, expected_params=_put_params(conditional=True))
+        stubber.add_client_error("put_object", "PreconditionFailed", http_status_code=412, expected_params=_put_params(conditional=True))
+        assert _upload(client) == URL
+        stubber.assert_no_pending_responses()
+
+
+def test_conditional_put_overwrites_after_repeated_conflicts(client):
+    with Stubber(client.s3_client) as stubber:
+        for _ in range(CONDITIONAL_PUT_ATTEMPTS):
+            stubber.add_client_error("put_object", "ConditionalRequestConflict", http_status_code=409, expected_params=_put_params(conditional=True))
+        stubber.add_response("put_object", {}, _put_params(conditional=False))
+        assert _upload(client) == URL
+        stubber.assert_no_pending_responses()
+
+
+def test_conditional_put_falls_back_when_not_implemented(client):
+    with Stubber(client.s3_client) as stubber:
+        stubber.add_client_error("put_object", "NotImplemented", http_status_code=501, expected_params=_put_params(conditional=True))
+        stubber.add_response("put_object", {}, _put_params(conditional=False))
+        # 之后的上传直接使用普通 PUT
+        stubber.add_response("put_object", {}, _put_params(conditional=False))
+        assert _upload(client) == URL
+        assert _upload(client) == URL
+        stubber.assert_no_pending_responses()
+
+
+def test_conditional_put_raises_other_errors(client):
+    with Stubber(client.s3_client) as stubber:
+        stubber.add_client_error("put_object", "AccessDenied", http_status_code=403, expected_params=_put_params(conditional=True))
+        with pytest.raises(StorageError):
+            _upload(client)
+
+
+def test_multipart_upload_proceeds_when_head_is_forbidden(client):
+    # 仅有 PutObject 权限的凭证 HEAD 对象返回 403，无法判断是否存在时直接上传
+    data = b"x" * (MULTIPART_THRESHOLD + 1)
+    with Stubber(client.s3_client) as stubber:
+        stubber.add_client_error("head_object", "403", http_status_code=403, expected_params={"Bucket": "bucket1", "Key": "big.html"})
+        stubber.add_response("create_multipart_upload", {"Bucket": "bucket1", "Key": "big.html", "UploadId": "upload-1"})
+        stubber.add_response("upload_part", {"ETag": '"etag-1"'})
+        stubber.add_response("upload_part", {"ETag": '"etag-2"'})
+        stubber.add_response("complete_multipart_upload", {})
+        assert client.upload_bytes(data, "big.html", skip_existing=True) == "https://cdn.example.com/big.html"
+        stubber.assert_no_pending_responses()
+
+
+def test_connection_pool_covers_all_upload_threads(client):
+    upload_workers = src.s3.get_config().mcp_server.upload_workers
+    assert client.s3_client.meta.config.max_pool_connections == upload_workers * MULTIPART_MAX_CONCURRENCY